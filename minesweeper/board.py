@@ -4,6 +4,19 @@ from .debug import debug_print
 
 config = Config()
 
+# the kinds of cells, as far as displaying them is concerned. see Cell.kind
+COVERED = 0
+NUMBER = 1
+FLAG = 2
+MINE = 3
+EXPLODED = 4
+
+# the symbols of the cells that aren't numbers, with and without emojis, in
+# the order of (exploded, flagged mine, mine, flag)
+SYMBOLS = {True: ('💥', '🏁', '💣', '🚩'), False: ('＊', 'Ｘ', 'Ｏ', 'Ｆ')}
+# full width digits
+NUMBERS = tuple(chr(0xff10 + value) for value in range(9))
+
 
 class GameOver(Exception):
     """
@@ -54,24 +67,28 @@ class Cell(metaclass = CellMeta):
         self.is_highlighted=False
         self.is_exploded=False
         self.is_mine=False
-        self.is_mine=False
         self.value = 0
         self.surroundings = []  # this will be initialized in self.calc_values()
+        self.board = None  # this will be set by the board owning the cell
+        self.dirty = True  # whether the cell changed since it was last displayed
 
     def flag(self):
         """Flag the cell. If it's flagged, unflag it"""
         if not self.is_revealed:
-            debug_print(f'{repr(self)} toggle flag')
+            debug_print('%r toggle flag', self)
             self.is_flagged = not self.is_flagged
+            self.board.flagged += 1 if self.is_flagged else -1
+            self.dirty = True
 
     def explode(self):
         """Set the cell to have exploded"""
-        debug_print(f'{repr(self)} set exploded')
+        debug_print('%r set exploded', self)
         self.is_exploded=True
+        self.dirty = True
 
     def set_mine(self):
         """Set the cell to be a mine"""
-        debug_print(f'{repr(self)} set mine')
+        debug_print('%r set mine', self)
         self.is_mine=True
 
     def highlight(self, force = False):
@@ -79,14 +96,15 @@ class Cell(metaclass = CellMeta):
         Toggles the highlghting state of the cell. blocks the highlight if the
         cell is revealed or flagged
         """
+        self.dirty = True
         if force:
-            debug_print(f'{repr(self)} toggle highlight (force)')
+            debug_print('%r toggle highlight (force)', self)
             self.is_highlighted=not self.is_highlighted
         elif not self.is_revealed:
-            debug_print(f'{repr(self)} toggle highlight')
+            debug_print('%r toggle highlight', self)
             self.is_highlighted = not self.is_highlighted
         else:
-            debug_print(f'{repr(self)} remove highlight')
+            debug_print('%r remove highlight', self)
             self.is_highlighted=False
 
     def reveal(self, chain = False, force = False):
@@ -98,8 +116,12 @@ class Cell(metaclass = CellMeta):
         """
         if self.is_flagged and not force:
             return []  # A flagged cell can't be revealed until unflagged
-        debug_print(f'{repr(self)} reveal')
+        debug_print('%r reveal', self)
+        if not self.is_revealed and not self.is_mine:
+            self.board.revealed_safe += 1
         self.is_revealed=True
+        self.board.revealed[self.y * self.board.width + self.x] = 1
+        self.dirty = True
         self.is_highlighted=False
         if self.is_mine and not force:
             raise GameOver(self)
@@ -118,23 +140,39 @@ class Cell(metaclass = CellMeta):
                 return to_reveal
         return []
 
+    @property
+    def kind(self):
+        """
+        the kind of the cell as it is displayed, in the same order of
+        precedence as __str__
+        """
+        if self.is_exploded:
+            return EXPLODED
+        if self.is_revealed and self.is_mine:
+            return MINE
+        if self.is_flagged:
+            return FLAG
+        if self.is_revealed:
+            return NUMBER
+        return COVERED
+
     def __str__(self):
         """
         converts the cell to appropriate emoji (or not) to be displayed
         """
-        emo = config.use_emojis
+        exploded, flagged_mine, mine, flag = SYMBOLS[config.use_emojis]
         if self.is_exploded:
-            return '💥' if emo else '＊'
+            return exploded
         if self.is_revealed and self.is_mine:
             if self.is_flagged:
-                return '🏁' if emo else 'Ｘ'
-            return '💣' if emo else 'Ｏ'
+                return flagged_mine
+            return mine
         if self.is_flagged:
-            return '🚩' if emo else 'Ｆ'
+            return flag
         if self.is_revealed:
             # if self.value == 0:
             #     return '　'
-            return chr(0xff10 + self.value)
+            return NUMBERS[self.value]
         return '　'
 
     def __repr__(self):
@@ -199,10 +237,22 @@ class Board:
         self.cells = []
         self.width = config.board_width
         self.height = config.board_height
+
+        # the revealed state of every cell in the order of self.cells, kept
+        # in sync by the cells so the ui can compare it between frames
+        # without going through every cell
+        self.revealed = bytearray(self.width * self.height)
+        # the number of revealed cells that aren't mines, so that checking
+        # for a win doesn't have to go through every cell
+        self.revealed_safe = 0
+        # the number of flagged cells, kept by the cells for the same reason
+        self.flagged = 0
+
         for y in range(self.height):
             self.board.append([])
             for x in range(self.width):
                 cell = Cell(y, x)
+                cell.board = self
                 self.board[-1].append(cell)
                 self.cells.append(cell)
 
@@ -267,7 +317,7 @@ class Board:
         """
         :return: a boolean indicating whether the game has been won
         """
-        return all(c.is_revealed or c.is_mine for c in self.cells)
+        return self.revealed_safe == len(self.cells) - config.mine_count
 
     def reveal_all(self):
         """
@@ -289,9 +339,13 @@ class Board:
             cell.is_mine = False
             cell.value = 0
             cell.surroundings = []
+            cell.dirty = True
+        self.revealed[:] = bytes(len(self.revealed))
+        self.revealed_safe = 0
+        self.flagged = 0
 
     def flag_count(self):
         """
-        calculates total number of flaged cells
+        returns the total number of flagged cells
         """
-        return sum(s.is_flagged for s in self.cells)
+        return self.flagged
@@ -81,4 +81,27 @@ for t, s in BOX_PAINTING_SYMBOLS_DICT.items():
 
 def box(up: int = -1, down: int = -1, left: int = -1, right: int = -1) -> str:
     """A convenient function for indexing the box drawing symbols"""
-    return BOX_PAINTING_SYMBOLS[(up + 1) * 3 ** 3 + (down + 1) * 3 ** 2 + (left + 1) * 3 + (right + 1)]
\ No newline at end of file
+    return BOX_PAINTING_SYMBOLS[(up + 1) * 3 ** 3 + (down + 1) * 3 ** 2 + (left + 1) * 3 + (right + 1)]
+
+# the grid is painted in 2x2 clusters of cells, and every character inside
+# a cluster is decided by which of the 4 cells are still covered. they are
+# looked up from these tables instead of calling box() for each character.
+# the clusters are indexed by (top left, top right, bottom left, bottom right)
+# as a 4-bit number, the lines by whether either of the 2 cells beside it is
+# covered.
+CLUSTER_CENTERS = [
+    box(tl or tr, bl or br, tl or bl, tr or br)
+    for tl in (0, 1) for tr in (0, 1) for bl in (0, 1) for br in (0, 1)
+]
+HORIZONTAL_LINES = [box(left=covered, right=covered) * 4 for covered in (0, 1)]
+VERTICAL_LINES = [box(up=covered, down=covered) for covered in (0, 1)]
+
+# the tees along the outer border of the grid, indexed by whether the cells
+# before and after it are covered, and the corners at the ends of the top
+# and bottom lines, indexed by whether the corner cell is covered.
+TOP_TEES = [box(left=a, right=b, down=a or b) for a in (0, 1) for b in (0, 1)]
+BOTTOM_TEES = [box(left=a, right=b, up=a or b) for a in (0, 1) for b in (0, 1)]
+LEFT_TEES = [box(up=a, down=b, right=a or b) for a in (0, 1) for b in (0, 1)]
+RIGHT_TEES = [box(up=a, down=b, left=a or b) for a in (0, 1) for b in (0, 1)]
+TOP_CORNERS = [(box(right=c, down=c), box(left=c, down=c)) for c in (0, 1)]
+BOTTOM_CORNERS = [(box(right=c, up=c), box(left=c, up=c)) for c in (0, 1)]
@@ -12,38 +12,68 @@ in bash. Then, run this program with the --debug flag.
 """
 
 import os
+import queue
+import threading
 from .config import Config
 
 config = Config()
 
 fd = 0
 
+# writing to the pipe blocks whenever the reader falls behind, so the
+# messages are handed over to a writer thread instead of being written
+# from the render loop
+messages = queue.Queue()
+writer = None
+
+
+def write_messages():
+    """drains the message queue into the pipe until None is received"""
+    while True:
+        message = messages.get()
+        if message is None:
+            return
+        os.write(fd, message)
+
 
 def init_print():
     """initializes the pipe"""
-    global fd
+    global fd, writer
     if config.debug:
         if not os.path.exists('debug'):
             os.mkfifo('debug')
         print('waiting for receiving pipe to attach')
         fd = os.open('debug', os.O_WRONLY)
         print('attached')
+        writer = threading.Thread(target=write_messages, daemon=True)
+        writer.start()
 
 
-def debug_print(*args, end = '\n', sep = ' '):
+def debug_print(message, *args, end = '\n'):
     """
-    simulates the behavior of __builtins__.print but send it to the named pipe.
-    ignores all invocations unless debug mode is set.
+    sends a message to the named pipe. ignores all invocations unless debug
+    mode is set. the message is formatted with the % operator only after
+    that check, so that callers on hot paths don't pay for formatting the
+    arguments when debug mode is off.
+    :param message: the message, or a %-format string if args are given
+    :param args: the arguments of the format string
     """
-    if config.debug:
-        os.write(fd, sep.join(map(str, args)).encode())
-        os.write(fd, end.encode())
+    if not config.debug:
+        return
+    if args:
+        message = message % args
+    messages.put_nowait((str(message) + end).encode())
 
 
 def end_print():
     """
     closes the file descriptor associated with the pipe. do not delete it as
-    the looping cat will complain otherwise.
+    the looping cat will complain otherwise. pending messages are flushed
+    before the pipe is closed.
     """
+    global writer
     if config.debug:
+        messages.put_nowait(None)
+        writer.join()
+        writer = None
         os.close(fd)
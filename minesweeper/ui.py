@@ -1,16 +1,20 @@
-import curses.panel
-import datetime
+import curses
+import select
 import signal
 import time
 import traceback
+import types
 import sys
-from math import ceil, floor, log10
-from .board import Board, Cell, GameOver
+from math import floor, log10
+from .board import Board, Cell, GameOver, NUMBER
 from .config import config
 from .debug import debug_print as _debug_print
-from enum import IntFlag
+from collections import deque
+from functools import lru_cache
+from itertools import chain
 from textwrap import dedent
-from .box import box
+from .box import (CLUSTER_CENTERS, HORIZONTAL_LINES, VERTICAL_LINES,
+                  TOP_TEES, BOTTOM_TEES, LEFT_TEES, RIGHT_TEES, TOP_CORNERS, BOTTOM_CORNERS)
 
 # ANSI color code for each color
 if config.dark_mode:
@@ -44,19 +48,49 @@ UI_ALT_HIGHLIGHT = 3
 UI_ERROR = 4
 SYSTEM_DEFAULT = 5
 
-# a simple wrapper around the mouse events for easier bitmask processing
-MouseEvent = IntFlag('MouseEvent',
-                     [(v, getattr(curses, v)) for v in filter(lambda s: s.startswith('BUTTON'), dir(curses))] +
-                     [('DRAG', 1 << (27 if sys.platform == 'darwin' else 28))]
-                     )  # trials and errors suggest this is the code for drag
+# curses attributes of the color pairs used every frame, filled in by main()
+# once the colors are initialized. the cells are indexed by
+# value << 1 | highlight, and are bold
+CELL_ATTRS = []
+UI_HIGHLIGHT_ATTR = 0
+UI_ALT_HIGHLIGHT_ATTR = 0
+
+# what a cell paints for each of its looks with the current emoji setting,
+# see CellWidget.render. it's filled in as the looks are first seen, since
+# the attributes above only exist once the colors are initialized
+CELL_PAINTS = {}
+
+# the masks of the mouse events, kept as plain ints so that testing and
+# clearing the bits of an event doesn't go through an enum
+BUTTON1_PRESSED = curses.BUTTON1_PRESSED
+BUTTON1_RELEASED = curses.BUTTON1_RELEASED
+BUTTON2_PRESSED = curses.BUTTON2_PRESSED
+BUTTON2_RELEASED = curses.BUTTON2_RELEASED
+BUTTON3_PRESSED = curses.BUTTON3_PRESSED
+BUTTON3_RELEASED = curses.BUTTON3_RELEASED
+DRAG = 1 << (27 if sys.platform == 'darwin' else 28)  # trials and errors suggest this is the code for drag
+
+# the lock of each button on RootWidget, and the masks that set and clear it
+BUTTON_LOCKS = (('button1_pressed', BUTTON1_PRESSED, BUTTON1_RELEASED),
+                ('button2_pressed', BUTTON2_PRESSED, BUTTON2_RELEASED),
+                ('button3_pressed', BUTTON3_PRESSED, BUTTON3_RELEASED))
+
+
+# the title in the middle of the top bar of the window
+TITLE = 'TERMINAL MINESWEEPER'
+
+# the startup and exit animations reveal one row per frame at this pace
+ANIMATION_FRAME_TIME = 0.02
 
 
 def pad_window(line, width, center=False):
     """Pad the side of a window to a width"""
     if not center:
-        return ' │' + line + ' ' * (width - len(line) - 4) + '│ '
-    return ' │' + ' ' * floor((width - len(line) - 4) / 2) + line + ' ' * ceil(
-        (width - len(line) - 4) / 2) + '│ '
+        return f' │{line.ljust(width - 4)}│ '
+    # str.center() doesn't always put the odd space on the right, so the
+    # padding is split by hand
+    padding = width - len(line) - 4
+    return f' │{" " * (padding // 2)}{line}{" " * (padding - padding // 2)}│ '
 
 
 def cell_color(value, highlight):
@@ -67,12 +101,26 @@ def cell_color(value, highlight):
     return (value << 4) | (highlight << 3) | 0b111
 
 
-def debug_print(*args, **kwargs):
+@lru_cache(maxsize=256)
+def format_fps(millifps: int) -> str:
+    """
+    formats the fps label, rounded to 4 significant figures. cached because
+    the fps is usually stable, so the same label is asked for over and over
+    :param millifps: the fps multiplied by 1000, so that it can be a cache key
+    """
+    fps = millifps / 1000
+    return f'FPS: {round(fps, 3 - floor(log10(fps))):0<5}'
+
+
+def debug_print(message, *args, **kwargs):
     """
     a wrapper around the debug printing function so that frame counter
-    is included.
+    is included. takes a %-format string and its arguments, see
+    debug.debug_print
     """
-    _debug_print(f'Frame {Widget.root.frame_count}:', *args, **kwargs)
+    if not config.debug:
+        return
+    _debug_print('Frame %d: ' + message, Widget.root.frame_count, *args, **kwargs)
 
 
 class InsufficientScreenSpace(Exception):
@@ -90,23 +138,21 @@ class FPSMonitor:
         initializes the fps monitor. the result will not be stable until at
         lease 100 frames are rendered
         """
-        cur_time = time.time()
-        self.data = [cur_time - (100 - i) / (config.framerate or 60) for i in range(100)]
+        cur_time = time.perf_counter()
+        self.data = deque((cur_time - (100 - i) / (config.framerate or 60) for i in range(100)), maxlen=100)
+        self.fps = self.calc_fps()
 
     def tick(self):
         """rotates the saves frame rendering time"""
-        self.data.append(time.time())
-        self.data.pop(0)
+        # the oldest time falls off the other end of the deque
+        self.data.append(time.perf_counter())
+        # the fps is read more than once per frame, so it's only calculated
+        # when it changes
+        self.fps = self.calc_fps()
 
-    @property
-    def fps(self):
+    def calc_fps(self):
         """calculates the fps, averaging on the past 100 frames"""
-        return 1 / ((self.data[-1] - self.data[1]) / 100)
-
-    @property
-    def last_frame(self):
-        """returns the last time a frame was rendered"""
-        return self.data[-1]
+        return (len(self.data) - 1) / (self.data[-1] - self.data[0])
 
 
 class Widget:
@@ -120,18 +166,63 @@ class Widget:
     # initialized
     root = None
 
+    # the entering/exiting animation is the same for every widget, so the
+    # counter is shared by the class instead of being copied down the tree
+    _animation_frame = 0
+
     def __init__(self, parent, y, x):
         """default widget initializer"""
         self.parent = parent
         self.x = x
         self.y = y
         self.subwidgets = []
-        self._animation_frame = 0
+        self.calc_window_offset()
+
+        # whether the widget has to paint all of itself on the next frame.
+        # only the grid and the cells check it, the other widgets are small
+        # enough to be painted every frame
+        self.dirty = True
 
     def anchor(self, y: int, x: int):
         """Set the x and y of the widget"""
+        if y == self.y and x == self.x:
+            return
         self.y = y
         self.x = x
+        self.calc_window_offset()
+
+    def calc_window_offset(self):
+        """
+        calculates where the widget is on the window, so that addstr can
+        write to the window directly instead of going through every parent
+        """
+        if isinstance(self.parent, Widget):
+            self.window_y = self.parent.window_y + self.y
+            self.window_x = self.parent.window_x + self.x
+        else:
+            # the root widget, whose parent is the window
+            self.window_y = self.y
+            self.window_x = self.x
+        for w in self.subwidgets:
+            w.calc_window_offset()
+
+    def invalidate(self, y: int, x: int):
+        """
+        marks the widget, and the subwidgets containing (y, x), to be painted
+        again because something else was painted over (y, x)
+        """
+        self.dirty = True
+        for w in self.subwidgets:
+            if w.y <= y < w.y + w.h and w.x <= x < w.x + w.w:
+                w.invalidate(y - w.y, x - w.x)
+
+    def covers(self, other) -> bool:
+        """
+        whether the area of the other widget is entirely within this one.
+        both widgets must have the same parent
+        """
+        return (self.y <= other.y and other.y + other.h <= self.y + self.h
+                and self.x <= other.x and other.x + other.w <= self.x + self.w)
 
     def addstr(self, y: int, x: int, text, *args, **kwargs):
         """
@@ -144,13 +235,53 @@ class Widget:
         :return: None
         """
         try:
-            text = str(text)
-            if config.show_animation:
-                # TODO: change the animation to left to right
-                if y <= self.animation_frame:
-                    self.parent.addstr(y + self.y, x + self.x, text, *args, **kwargs)
-            else:
-                self.parent.addstr(y + self.y, x + self.x, text, *args, **kwargs)
+            # TODO: change the animation to left to right
+            if y <= Widget._animation_frame:
+                self.parent.addstr(y + self.y, x + self.x, str(text), *args, **kwargs)
+        except curses.error:
+            if not config.ignore_failures:
+                raise InsufficientScreenSpace
+
+    def addstr_direct(self, y: int, x: int, text, *args, **kwargs):
+        """
+        the same as addstr but without checking the animation. it replaces
+        addstr whenever there is no animation going on, see animate(). the
+        text is written straight to the window at the widget's offset
+        """
+        try:
+            Widget.root.window.addstr(y + self.window_y, x + self.window_x, str(text), *args, **kwargs)
+        except curses.error:
+            if not config.ignore_failures:
+                raise InsufficientScreenSpace
+
+    def animate(self, animating: bool):
+        """
+        switches addstr of this widget and its subwidgets between the
+        animated version and the direct one, so that the animation check is
+        skipped for the thousands of calls each frame once the animation has
+        finished. only the instances are changed, so other widget trees in
+        the same process are left alone
+        """
+        if animating:
+            self.__dict__.pop('addstr', None)  # back to the class's addstr
+        else:
+            self.addstr = types.MethodType(Widget.addstr_direct, self)
+        for w in self.subwidgets:
+            w.animate(animating)
+
+    def addch(self, y: int, x: int, ch, *args, **kwargs):
+        """
+        A patched version of curses.window.addch to support animations
+        :param y: the y coordinate
+        :param x: the x coordinate
+        :param ch: the character to add, preferably one of curses.ACS_*
+        :param args: extra arguments passing to curses.window.addch
+        :param kwargs: extra keywords passing to curses.window.addch
+        :return: None
+        """
+        try:
+            if not config.show_animation or y <= Widget._animation_frame:
+                self.parent.addch(y + self.y, x + self.x, ch, *args, **kwargs)
         except curses.error:
             if not config.ignore_failures:
                 raise InsufficientScreenSpace
@@ -177,7 +308,9 @@ class Widget:
         if etype == 'mouse':
             y, x, mouse = args
             for w in self.subwidgets:
-                if y >= w.y and x >= w.x:
+                # only descend into the widgets that actually contain the
+                # cursor, otherwise the grid would receive every event
+                if w.y <= y < w.y + w.h and w.x <= x < w.x + w.w:
                     # coordinate translation
                     w.dispatch_event('mouse', y - w.y, x - w.x, mouse)
             self.mouse_event(*args)
@@ -198,10 +331,8 @@ class Widget:
 
     @animation_frame.setter
     def animation_frame(self, v):
-        """chains the animation frame to subwidgets"""
-        self._animation_frame = v
-        for w in self.subwidgets:
-            w.animation_frame = v
+        """sets the animation frame for all widgets at once"""
+        Widget._animation_frame = v
 
 
 class CellWidget(Widget):
@@ -211,21 +342,49 @@ class CellWidget(Widget):
     """
 
     highlighted = set()
-    last_clear = 0
+    last_clear = 0  # the time.perf_counter() of the last clear_highlight()
+
+    # the cells that painted the highlight on both sides of themselves in
+    # the last frame
+    padded = set()
 
     def __init__(self, parent, y, x, cell: Cell):
         """initializes the cell"""
         super().__init__(parent, y, x)
         self.cell = cell
         self.h = 1
-        self.w = 4
+        self.w = 5  # including the vertical line on the right
+
+        # the index of the cell in board.cells and the grid's subwidgets
+        self.flat_index = cell.y * parent.board.width + cell.x
 
     @classmethod
     def clear_highlight(cls):
         """clears all the highlighted cells"""
         while len(cls.highlighted):
             cls.highlighted.pop().highlight()
-        cls.last_clear = cls.root.frame_count
+        cls.last_clear = time.perf_counter()
+
+    @classmethod
+    def highlight_expired(cls):
+        """
+        whether the highlight is due to be cleared, which happens every 50ms
+        in case the cursor leaves the screen. it's timed by the clock since
+        frames aren't rendered at a steady rate
+        """
+        return not cls.root.button2_pressed and time.perf_counter() > cls.last_clear + 0.05
+
+    @classmethod
+    def clear_padding(cls):
+        """
+        blanks the sides of the cells that are no longer highlighted. the
+        window isn't erased between frames, and a cell that isn't highlighted
+        only paints the middle of itself
+        """
+        for w in [w for w in cls.padded if not w.cell.is_highlighted]:
+            w.addstr(0, 0, ' ')
+            w.addstr(0, 3, ' ')
+            cls.padded.discard(w)
 
     def area_reveal(self):
         """
@@ -233,7 +392,7 @@ class CellWidget(Widget):
         which will succeed only if the number of flags around
         self is the same as the value of self. clears prevous highlights.
         """
-        debug_print(f'{repr(self.cell)}: area reveal')
+        debug_print('%r: area reveal', self.cell)
         self.clear_highlight()
         self.cell.area_reveal(True)
 
@@ -242,23 +401,31 @@ class CellWidget(Widget):
         highlights the 3x3 area centered at self, excluding
         any flagged or revealed cell. clears previous highlights.
         """
-        debug_print(f'{repr(self.cell)}: area highlight')
-        self.clear_highlight()
-        for c in self.cell.surroundings:
+        debug_print('%r: area highlight', self.cell)
+        area = set(self.cell.surroundings)
+        area.add(self.cell)
+
+        # while dragging most of the area stays the same, so only the cells
+        # leaving or entering it are toggled
+        leaving = self.highlighted - area
+        entering = area - self.highlighted
+        for c in leaving:
             c.highlight()
-            self.highlighted.add(c)
-        self.cell.highlight()
-        self.highlighted.add(self.cell)
+        for c in entering:
+            c.highlight()
+        self.highlighted.difference_update(leaving)
+        self.highlighted.update(entering)
+        CellWidget.last_clear = time.perf_counter()
 
     def reveal(self):
         """
         reveals self. may raise GameOver exception if self is a mine
         """
-        debug_print(f'{repr(self.cell)}: reveal')
+        debug_print('%r: reveal', self.cell)
         if self.root.game_start:
             self.root.game_start = False
             self.root.game_over = False
-            self.root.time_started = datetime.datetime.now()
+            self.root.time_started = time.monotonic()
             self.root.board.init_mines(self.cell)
         self.cell.reveal(True)
 
@@ -266,7 +433,7 @@ class CellWidget(Widget):
         """
         flags self and clear highlight on self
         """
-        debug_print(f'{repr(self.cell)}: flag')
+        debug_print('%r: flag', self.cell)
         if not self.root.game_start and not self.root.game_over:
             self.cell.flag()
 
@@ -287,25 +454,25 @@ class CellWidget(Widget):
             # ignores the event as it is not relevant
             return
 
-        if (MouseEvent.BUTTON2_RELEASED in mouse):
+        if (mouse & BUTTON2_RELEASED):
             # handles area reveal
             self.area_reveal()
 
-        if (MouseEvent.BUTTON2_PRESSED in mouse or
-                (self.root.button2_pressed and MouseEvent.DRAG in mouse)):
+        if (mouse & BUTTON2_PRESSED or
+                (self.root.button2_pressed and mouse & DRAG)):
             # handles area highlight
             self.area_highlight()
 
-        if MouseEvent.BUTTON1_RELEASED in mouse:
+        if mouse & BUTTON1_RELEASED:
             # reveal the cell (GameOver exception will be caught in root)
             self.reveal()
 
-        if MouseEvent.BUTTON3_RELEASED in mouse:
+        if mouse & BUTTON3_RELEASED:
             # flag a cell
             self.flag()
 
         self.highlight()
-        self.parent.selected_cell = self.cell.y * self.parent.board.width + self.cell.x
+        self.parent.selected_cell = self.flat_index
 
     def keyboard_event(self, key):
         """
@@ -319,26 +486,45 @@ class CellWidget(Widget):
         elif key == 'f':
             self.flag()
 
+    def calc_paints(self):
+        """
+        calculates what the cell paints in its current state, as a tuple of
+        (x, text, extra arguments to addstr)
+        """
+        cell = self.cell
+        text = str(cell)
+
+        if cell.kind != NUMBER:  # mine, flag, or blank
+            if cell.is_highlighted:
+                return (0, f' {text} ', (UI_ALT_HIGHLIGHT_ATTR if cell.is_flagged else UI_HIGHLIGHT_ATTR,)),
+            return (1, text, ()),
+        attr = CELL_ATTRS[cell.value << 1 | cell.is_highlighted]
+        if cell.is_highlighted:
+            return (0, ' ', (UI_HIGHLIGHT_ATTR,)), (3, ' ', (UI_HIGHLIGHT_ATTR,)), (1, text, (attr,))
+        return (1, text, (attr,)),
+
     def render(self):
         """
         renders the cell
         """
 
-        try:
-            v = int(str(self.cell))  # a quick test for non-numbered cell
-        except ValueError:  # mine, flag, or blank
-            if self.cell.is_highlighted:
-                self.addstr(0, 0, f' {self.cell} ',
-                            curses.color_pair(UI_ALT_HIGHLIGHT if self.cell.is_flagged else UI_HIGHLIGHT))
-            else:
-                self.addstr(0, 1, self.cell)
-        else:
-            if self.cell.is_highlighted:
-                self.addstr(0, 0, ' ', curses.color_pair(UI_HIGHLIGHT))
-                self.addstr(0, 3, ' ', curses.color_pair(UI_HIGHLIGHT))
-            attrs = curses.color_pair(cell_color(v, self.cell.is_highlighted))
-            attrs |= curses.A_BOLD  # make them bold
-            self.addstr(0, 1, self.cell, attrs)
+        cell = self.cell
+        # a cell only has a few dozen different looks, so what it paints is
+        # only calculated the first time each of them is seen. the cache is
+        # cleared when emojis are toggled
+        key = (cell.kind, cell.is_flagged, cell.value, cell.is_highlighted)
+        paints = CELL_PAINTS.get(key)
+        if paints is None:
+            paints = CELL_PAINTS[key] = self.calc_paints()
+
+        if cell.is_highlighted:
+            self.padded.add(self)
+
+        for x, text, args in paints:
+            self.addstr(0, x, text, *args)
+
+        self.dirty = False
+        cell.dirty = False
 
         # clear highlight after the rendering, so if a highlight is added
         # back in the next tick the screen won't flicker
@@ -364,82 +550,210 @@ class GridWidget(Widget):
         self.h = self.board.height * 2 + 1
         self.w = self.board.width * 5 + 1
 
-    def render(self):
+        # the outer border only changes when a cell on the edge of the board
+        # is revealed, so it is only recalculated when that happens
+        self.edges_state = None
+        self.edges = []
+
+        # the revealed state of every cell as of the last time the border
+        # was calculated, and the characters to paint inside the border for
+        # each 2x2 cluster of cells
+        self.revealed = None
+        self.clusters = [()] * ((self.board.width - 1) * (self.board.height - 1))
+
+        # the border joined into rows, see calc_lines
+        self.lines = []
+        self.bars = []
+
+        # the rows that have to be painted again, see invalidate
+        self.dirty_rows = set()
+
+    def dispatch_event(self, etype, *args):
         """
-        renders the grid. this function is probably the most computationally
-        heavy function of the entire program and takes the most amount of
-        rendering time due to several double for loops.
+        the cells are laid out in a regular grid, so the cell under the
+        cursor is calculated directly instead of testing every cell
         """
+        if etype != 'mouse':
+            return super().dispatch_event(etype, *args)
+
+        y, x, mouse = args
+        # the even rows and the first column are the border
+        if y % 2 and x >= 1:
+            cy = (y - 1) // 2
+            cx = (x - 1) // 5
+            if cy < self.board.height and cx < self.board.width:
+                w = self.subwidgets[cy * self.board.width + cx]
+                w.dispatch_event('mouse', y - w.y, x - w.x, mouse)
+        self.mouse_event(*args)
+
+    def invalidate(self, y: int, x: int):
+        """
+        marks the row of the border and the cell containing (y, x) to be
+        painted again
+        """
+        self.dirty_rows.add(y)
+        if y % 2 and x >= 1:
+            cy = (y - 1) // 2
+            cx = (x - 1) // 5
+            if cy < self.board.height and cx < self.board.width:
+                self.subwidgets[cy * self.board.width + cx].dirty = True
+
+    def calc_clusters(self, revealed: bytes):
+        """
+        recalculates the inside of the border for the clusters that contain
+        a cell whose revealed state is different from the last calculation
+        :param revealed: the revealed state of every cell, in the order of
+        board.cells
+        """
+        width = self.board.width
+        height = self.board.height
 
-        width = self.board.width * 5 + 1
-        height = self.board.height * 2 + 1
-
-        # paint the entire board excluding the 4 corners
-        for x in range(self.board.width - 1):
-            for y in range(self.board.height - 1):
-                # the grid is divided into 2x2 clusters so that the character of
-                # the center can be calculated, kinda like the convolution in
-                # a CNN
-
-                tl = not self.board[y, x].is_revealed  # top left
-                tr = not self.board[y, x + 1].is_revealed  # top right
-                bl = not self.board[y + 1, x].is_revealed  # bottom left
-                br = not self.board[y + 1, x + 1].is_revealed  # bottom right
-
-                # special case for first column
-                if not x:
-                    self.addstr(y * 2 + 1, 0, box(up=tl, down=tl))
-                    self.addstr(y * 2 + 3, 0, box(up=bl, down=bl))
-                    self.addstr(y * 2 + 2, 0, box(up=tl, down=bl, right=tl or bl))
-
-                # special case for last column
-                if x == self.board.width - 2:
-                    self.addstr(y * 2 + 1, x * 5 + 10, box(up=tr, down=tr))
-                    self.addstr(y * 2 + 3, x * 5 + 10, box(up=br, down=br))
-                    self.addstr(y * 2 + 2, x * 5 + 10, box(up=tr, down=br, left=tr or br))
-
-                # special case for first row
-                if not y:
-                    self.addstr(y * 2, x * 5 + 1, box(left=tl, right=tl) * 4)
-                    self.addstr(y * 2, x * 5 + 6, box(left=tr, right=tr) * 4)
-                    self.addstr(y * 2, x * 5 + 5, box(left=tl, right=tr, down=tl or tr))
-
-                # special case for last row
-                if y == self.board.height - 2:
-                    self.addstr(y * 2 + 4, x * 5 + 1, box(left=bl, right=bl) * 4)
-                    self.addstr(y * 2 + 4, x * 5 + 6, box(left=br, right=br) * 4)
-                    self.addstr(y * 2 + 4, x * 5 + 5, box(left=bl, right=br, up=bl or br))
-
+        if self.revealed is None:
+            dirty = range(len(self.clusters))
+        else:
+            dirty = set()
+            for i, (old, new) in enumerate(zip(self.revealed, revealed)):
+                if old != new:
+                    y, x = divmod(i, width)
+                    # the cell is part of up to 4 clusters
+                    for cy in (y - 1, y):
+                        for cx in (x - 1, x):
+                            if 0 <= cy < height - 1 and 0 <= cx < width - 1:
+                                dirty.add(cy * (width - 1) + cx)
+
+        for i in dirty:
+            # the grid is divided into 2x2 clusters so that the character of
+            # the center can be calculated, kinda like the convolution in
+            # a CNN
+            y, x = divmod(i, width - 1)
+            tl = not revealed[y * width + x]  # top left
+            tr = not revealed[y * width + x + 1]  # top right
+            bl = not revealed[(y + 1) * width + x]  # bottom left
+            br = not revealed[(y + 1) * width + x + 1]  # bottom right
+
+            self.clusters[i] = (
                 # horizontal lines
-                self.addstr(y * 2 + 2, x * 5 + 1, box(left=tl or bl, right=tl or bl) * 4)
-                self.addstr(y * 2 + 2, x * 5 + 6, box(left=tr or br, right=tr or br) * 4)
-
+                (y * 2 + 2, x * 5 + 1, HORIZONTAL_LINES[tl or bl]),
+                (y * 2 + 2, x * 5 + 6, HORIZONTAL_LINES[tr or br]),
                 # vertical lines
-                self.addstr(y * 2 + 1, x * 5 + 5, box(up=tl or tr, down=tl or tr))
-                self.addstr(y * 2 + 3, x * 5 + 5, box(up=bl or br, down=bl or br))
-
+                (y * 2 + 1, x * 5 + 5, VERTICAL_LINES[tl or tr]),
+                (y * 2 + 3, x * 5 + 5, VERTICAL_LINES[bl or br]),
                 # the center of the cluster
-                self.addstr(y * 2 + 2, x * 5 + 5, box(tl or tr, bl or br, tl or bl, tr or br))
+                (y * 2 + 2, x * 5 + 5, CLUSTER_CENTERS[tl << 3 | tr << 2 | bl << 1 | br]),
+            )
+
+    def calc_edges(self, revealed: bytes):
+        """
+        calculates the outer border of the grid, including the 4 corners, as a
+        list of (y, x, str) to be painted. the top and bottom rows are a whole
+        line, while the left and right columns are one character each.
+        :param revealed: the revealed state of every cell, in the order of
+        board.cells
+        """
+        width = self.board.width
+        top = [not r for r in revealed[:width]]
+        bottom = [not r for r in revealed[-width:]]
+        left = [not r for r in revealed[::width]]
+        right = [not r for r in revealed[width - 1::width]]
+
+        state = (top, bottom, left, right)
+        if state == self.edges_state:
+            return
+        self.edges_state = state
+
+        edges = []
+        for y, (row, tees, corners) in enumerate(((top, TOP_TEES, TOP_CORNERS),
+                                                  (bottom, BOTTOM_TEES, BOTTOM_CORNERS))):
+            line = [corners[row[0]][0]]
+            for x in range(self.board.width):
+                line.append(HORIZONTAL_LINES[row[x]])
+                if x < self.board.width - 1:
+                    line.append(tees[row[x] << 1 | row[x + 1]])
+            line.append(corners[row[-1]][1])
+            edges.append((y * (self.h - 1), 0, ''.join(line)))
+
+        for x, (col, tees) in enumerate(((left, LEFT_TEES), (right, RIGHT_TEES))):
+            for y in range(self.board.height):
+                edges.append((y * 2 + 1, x * (self.w - 1), VERTICAL_LINES[col[y]]))
+                if y < self.board.height - 1:
+                    edges.append((y * 2 + 2, x * (self.w - 1), tees[col[y] << 1 | col[y + 1]]))
+        self.edges = edges
+
+    def calc_lines(self):
+        """
+        joins the border calculated by calc_edges and calc_clusters into
+        whole rows, so that each horizontal line only needs a single addstr.
+        the vertical lines on the rows of cells are kept separately.
+        """
+        canvas = [[' '] * self.w for _ in range(self.h)]
+        for y, x, s in chain(self.edges, *self.clusters):
+            canvas[y][x:x + len(s)] = s
+        self.lines = [''.join(row) for row in canvas[::2]]
+        self.bars = [row[::5] for row in canvas[1::2]]
 
-        tl = not self.board[0][0].is_revealed  # top left
-        tr = not self.board[0][-1].is_revealed  # top right
-        bl = not self.board[-1][0].is_revealed  # bottom left
-        br = not self.board[-1][-1].is_revealed  # bottom right
+    def render(self):
+        """
+        renders the grid. this function is probably the most computationally
+        heavy function of the entire program and takes the most amount of
+        rendering time due to several double for loops.
+        """
 
-        # add the corners of the board
-        self.addstr(0, 0, box(right=tl, down=tl))
-        self.addstr(0, width - 1, box(left=tr, down=tr))
-        self.addstr(height - 1, 0, box(up=bl, right=bl))
-        self.addstr(height - 1, width - 1, box(up=br, left=br))
+        # the whole grid is only painted when the window was erased
+        repaint = self.dirty
+
+        # only recalculate the border when a cell was revealed or covered
+        # since the last frame, which is rare compared to the frame rate.
+        # a reveal usually only changes the border around a few cells, so
+        # only the rows that came out different are painted again
+        if self.board.revealed != self.revealed:
+            revealed = bytes(self.board.revealed)
+            lines, bars = self.lines, self.bars
+            self.calc_clusters(revealed)
+            self.calc_edges(revealed)
+            self.calc_lines()
+            self.revealed = revealed
+            if len(lines) != len(self.lines):
+                repaint = True  # nothing was calculated before
+            else:
+                for y, (old, new) in enumerate(zip(lines, self.lines)):
+                    if old != new:
+                        self.dirty_rows.add(y * 2)
+                for y, (old, new) in enumerate(zip(bars, self.bars)):
+                    if old != new:
+                        self.dirty_rows.add(y * 2 + 1)
+
+        # the horizontal lines are painted a whole row at a time. the rows
+        # in between also contain the cells, so only the vertical lines
+        # are painted there and the cells paint themselves
+        if repaint:
+            for y, line in enumerate(self.lines):
+                self.addstr(y * 2, 0, line)
+            for y, bars in enumerate(self.bars):
+                for x, bar in enumerate(bars):
+                    self.addstr(y * 2 + 1, x * 5, bar)
+        else:
+            for y in self.dirty_rows:
+                if not 0 <= y < self.h:
+                    continue
+                if y % 2:
+                    for x, bar in enumerate(self.bars[y // 2]):
+                        self.addstr(y, x * 5, bar)
+                else:
+                    self.addstr(y, 0, self.lines[y // 2])
+        self.dirty_rows.clear()
 
         if self.root.keyboard_mode:
             self.subwidgets[self.selected_cell].highlight(True)
 
+        # the cells are painted when they changed, or something was painted
+        # over them
         for w in self.subwidgets:
-            w.render()
+            if self.dirty or w.dirty or w.cell.dirty:
+                w.render()
+        self.dirty = False
 
         # clears highlight every 50ms in case the cursor leaves the screen
-        if not self.root.button2_pressed and self.root.frame_count > CellWidget.last_clear + self.root.monitor.fps / 20:
+        if CellWidget.highlight_expired():
             CellWidget.clear_highlight()
 
         if not (self.root.button2_pressed or self.root.button1_pressed or self.root.game_over):
@@ -473,11 +787,22 @@ class FPSWidget(Widget):
     def __init__(self, parent: Widget, y: int, x: int):
         super().__init__(parent, y, x)
         self.h = 1
+        self.millifps = None
+        self.last_update = float('-inf')
         self.set_fps(1)  # we don't want to take log10 of 0
 
     def set_fps(self, fps: int):
         self.fps = fps
-        self.str = f'FPS: {round(self.fps, 3 - floor(log10(self.fps))):0<5}'
+        # the label is only updated twice a second. a number that changes
+        # every frame can't be read anyway
+        now = time.perf_counter()
+        if now - self.last_update < 0.5:
+            return
+        self.last_update = now
+        millifps = max(int(fps * 1000), 1)
+        if millifps != self.millifps:
+            self.millifps = millifps
+            self.str = format_fps(millifps)
 
     def render(self):
         self.addstr(0, 0, self.str)
@@ -508,16 +833,24 @@ class FlagWidget(Widget):
     def __init__(self, parent: Widget, y: int, x: int):
         super().__init__(parent, y, x)
         self.h = 1
-        self.flags = config.mine_count
+        self.flags = None
+        self.set_flag_counts(config.mine_count)
 
     def set_flag_counts(self, n: int):
-        self.flags = n
+        # the count is set every frame but rarely changes, so the labels are
+        # only formatted when it does
+        if n != self.flags:
+            self.flags = n
+            self.emoji_text = f'🚩 × {n}'
+            self.text = f'Ｆ × {n}'
+            # +1 for the full width flag
+            self.w = len(f'F × {n}') + 1
 
     def render(self):
         if config.use_emojis:
-            self.addstr(0, 0, f'🚩 × {self.flags}')
+            self.addstr(0, 0, self.emoji_text)
         else:
-            self.addstr(0, 0, f'Ｆ × {self.flags}')
+            self.addstr(0, 0, self.text)
 
 
 class HelpWidget(Widget):
@@ -540,10 +873,15 @@ class HelpWidget(Widget):
         │  Exit Game:   [Ctrl-C]  │                          │
         ╰─────────────────────────┴──────────────────────────╯
         """)
+    HELP_WINDOW_LINES = tuple(HELP_WINDOW.splitlines())
+    HELP_WINDOW_ROW_LEN = len(HELP_WINDOW_LINES[0])
+    # +1 for the newline at the end of each row
+    HELP_WINDOW_STRIDE = HELP_WINDOW_ROW_LEN + 1
 
     def __init__(self, parent: Widget, y: int, x: int):
         super().__init__(parent, y, x)
         self.is_active = False
+        self.pad = None  # the help window is painted onto a pad only once
 
     @property
     def w(self):
@@ -566,6 +904,33 @@ class HelpWidget(Widget):
     def mouse_x(self):
         return Widget.root.mouse_x - self.x
 
+    def paint_pad(self):
+        """
+        copies the help window onto the screen from a pad, which takes a
+        single call instead of one addstr per line. the pad is created the
+        first time the help window is shown
+        """
+        if self.pad is None:
+            # +1 so that writing the last character doesn't move the cursor
+            # out of the pad
+            self.pad = curses.newpad(len(self.HELP_WINDOW_LINES), self.HELP_WINDOW_ROW_LEN + 1)
+            self.pad.bkgd(' ', curses.color_pair(DEFAULT))
+            for i, row in enumerate(self.HELP_WINDOW_LINES):
+                self.pad.addstr(i, 0, row)
+
+        bottom = self.y + len(self.HELP_WINDOW_LINES) - 1
+        if config.show_animation:
+            # only the rows that the animation has reached
+            bottom = min(bottom, Widget._animation_frame)
+        if bottom < self.y:
+            return
+        try:
+            self.pad.overwrite(Widget.root.window, 0, 0, self.y, self.x, bottom,
+                               self.x + self.HELP_WINDOW_ROW_LEN - 1)
+        except curses.error:
+            if not config.ignore_failures:
+                raise InsufficientScreenSpace
+
     def mouse_y(self):
         return Widget.root.mouse_y - self.y
 
@@ -580,20 +945,16 @@ class HelpWidget(Widget):
             mouse_y = self.mouse_y()
             mouse_x = self.mouse_x()
 
-            for i, row in enumerate(self.HELP_WINDOW.splitlines()):
-                self.addstr(i, 0, row)
+            self.paint_pad()
 
-            if mouse_y < self.h and mouse_x < self.w:
-                try:
-                    if self.HELP_WINDOW[mouse_y * (self.w + 1) + mouse_x] == ' ':
-                        Widget.root.window.addch(Widget.root.mouse_y, Widget.root.mouse_x, curses.ACS_DIAMOND)
-                except IndexError:
-                    pass
+            if 0 <= mouse_y < self.h and 0 <= mouse_x < self.HELP_WINDOW_ROW_LEN:
+                if self.HELP_WINDOW[mouse_y * self.HELP_WINDOW_STRIDE + mouse_x] == ' ':
+                    Widget.root.window.addch(Widget.root.mouse_y, Widget.root.mouse_x, curses.ACS_DIAMOND)
 
             if mouse_y == 1 and 1 <= mouse_x <= 4:
-                self.addstr(1, 1, ' Ｘ ', curses.color_pair(UI_HIGHLIGHT))
+                self.addstr(1, 1, ' Ｘ ', UI_HIGHLIGHT_ATTR)
             else:
-                self.addstr(1, 2, 'Ｘ')
+                self.addstr(1, 1, ' Ｘ ')
 
         # emo = config.use_emojis
         # self.addstr(self.status_y_offset + 14, self.status_x_offset + 11, 'Symbols')
@@ -610,7 +971,7 @@ class HelpWidget(Widget):
     def mouse_event(self, y, x, mouse):
         if not config.use_emojis:
             return
-        if MouseEvent.BUTTON1_RELEASED in mouse:
+        if mouse & BUTTON1_RELEASED:
             if not self.is_active:
                 if y == 0 and x == 0:
                     self.is_active = True
@@ -639,7 +1000,7 @@ class SmileyWidget(Widget):
 
     def mouse_event(self, y, x, mouse):
         """handles left click on the face (restart)"""
-        if (MouseEvent.BUTTON1_PRESSED in mouse
+        if (mouse & BUTTON1_PRESSED
                 and y == 0 and x <= 2
                 and config.use_emojis):
             self.root.restart()
@@ -658,22 +1019,44 @@ class RootWidget(Widget):
 
         # the window is the root widget's parent
         super().__init__(win, 0, 0)
+        # the animation counter is shared by every widget, so a new game has
+        # to start it over. mineshell can run several games in one process
+        Widget._animation_frame = 0
         self.window = win
+        # the size of the window. curses only resizes it when getch()
+        # returns KEY_RESIZE, so it's read again then instead of every frame
+        self.winh, self.winw = win.getmaxyx()
         self.board = Board()
         self.mouse_y = 0
         self.mouse_x = 0
         self.monitor = FPSMonitor()
 
+        # the areas of the widgets in the last frame, and where the mouse
+        # cursor was drawn. see render()
+        self.layout = None
+        self.cursor = None
+
+        # the horizontal lines of the window for the width they were made for
+        self.window_lines = (None, '', 0, '', '')
+
+        # where and when the last hover event was dispatched
+        self.last_hover = None
+        self.last_hover_time = -1
+
         # some useful variables
         self.should_exit = False
         self.force_rerender = False
         self.game_start = True
         self.game_over = True
         self.time_taken = '00:00.00'
-        self.time_started = datetime.datetime.now()
+        self.time_started = time.monotonic()
+        self.time_centis = 0  # hundredths of seconds shown by the timer
 
         self.frame_count = 0
         self.last_rerender = 0
+        self.next_frame = 0  # when the next frame is due, see tick()
+        # whether input was dispatched while waiting for the next frame
+        self.pending_input = False
 
         self.button1_pressed = False
         self.button2_pressed = False
@@ -703,11 +1086,14 @@ class RootWidget(Widget):
         self.help = HelpWidget(self, 0, 0)
         self.subwidgets.append(self.help)
 
+        # the only widgets that handle keyboard events
+        self.keyboard_targets = (self.grid, self.help)
+
         self.calc_widget_locations()
 
     def calc_widget_locations(self):
         """Reanchor all sub widgets"""
-        winh, winw = self.window.getmaxyx()
+        winh, winw = self.winh, self.winw
         grid_top = floor((winh - self.grid.h) / 2) + 2
         grid_bottom = grid_top + self.grid.h
 
@@ -745,28 +1131,37 @@ class RootWidget(Widget):
         draw the initial window. always identical to the one
         produced by calc_first_frame()
         """
-        winh, winw = self.window.getmaxyx()
-        self.window.addstr(0, 1, '╭' + '─' * (winw - 4) + '╮')
-        self.window.addch(1, 1, '│')
-        self.window.addch(1, winw - 2, '│')
-        self.window.addstr(1, (winw - 24) // 2 + 2, 'TERMINAL MINESWEEPER')
-        self.window.addstr(2, 1, '├' + '─' * (winw - 4) + '┤')
-        for y in range(3, winh - 1):
-            self.window.addch(y, 1, '│')
-            self.window.addch(y, winw - 2, '│')
-        self.window.addstr(winh - 1, 1, '╰' + '─' * (winw - 4) + '╯')
-
-    def tick(self):
+        winh, winw = self.winh, self.winw
+        if self.window_lines[0] != winw:
+            # the horizontal lines and where the title goes only change when
+            # the window is resized
+            self.window_lines = (winw,
+                                 '╭' + '─' * (winw - 4) + '╮',
+                                 2 + (winw - 4 - len(TITLE)) // 2,
+                                 '├' + '─' * (winw - 4) + '┤',
+                                 '╰' + '─' * (winw - 4) + '╯')
+        _, top, title_x, separator, bottom = self.window_lines
+
+        self.window.addstr(0, 1, top)
+        self.window.vline(1, 1, curses.ACS_VLINE, winh - 2)
+        self.window.vline(1, winw - 2, curses.ACS_VLINE, winh - 2)
+        self.window.addstr(1, title_x, TITLE)
+        self.window.addstr(2, 1, separator)
+        self.window.addstr(winh - 1, 1, bottom)
+
+    def process_events(self) -> bool:
         """
-        this function is called for each iteration of the mainloop,
-        it is responsible for processing and dispatching keyboard
-        events and scheduling each widget to render
+        reads and dispatches all the keyboard and mouse events that are
+        waiting, and the hover event if the cursor moved
+        :return: whether there was an event, so that there's something new
+        to render
         """
+        had_event = False
         all_events_processed = False
         while not all_events_processed:
-            winh, winw = self.window.getmaxyx()
             ch = self.window.getch()
             if ch == curses.KEY_RESIZE:
+                self.winh, self.winw = self.window.getmaxyx()
                 char = '\0'
                 self.force_rerender = True
                 etype = 'other'
@@ -775,7 +1170,7 @@ class RootWidget(Widget):
             elif ch == curses.KEY_MOUSE:
                 try:
                     _, mouse_x, mouse_y, z, mouse_button = curses.getmouse()
-                    mouse = MouseEvent(mouse_button)
+                    mouse = mouse_button
 
                     # curses can't recognized any tracking (1003) mode, so it
                     # just spams the previous events (button x released) when
@@ -786,45 +1181,23 @@ class RootWidget(Widget):
                     # can results in some strange mouse events unless a lock
                     # is in place
 
-                    if MouseEvent.BUTTON1_PRESSED in mouse:
-                        if self.button1_pressed:
-                            mouse &= ~MouseEvent.BUTTON1_PRESSED
-                        else:
-                            self.button1_pressed = True
-                    if MouseEvent.BUTTON2_PRESSED in mouse:
-                        if self.button2_pressed:
-                            mouse &= ~MouseEvent.BUTTON2_PRESSED
-                        else:
-                            self.button2_pressed = True
-                    if MouseEvent.BUTTON3_PRESSED in mouse:
-                        if self.button3_pressed:
-                            mouse &= ~MouseEvent.BUTTON3_PRESSED
-                        else:
-                            self.button3_pressed = True
-
-                    if MouseEvent.BUTTON1_RELEASED in mouse:
-                        if not self.button1_pressed:
-                            mouse &= ~MouseEvent.BUTTON1_RELEASED
-                        else:
-                            self.button1_pressed = False
-
-                    if MouseEvent.BUTTON2_RELEASED in mouse:
-                        if not self.button2_pressed:
-                            mouse &= ~MouseEvent.BUTTON2_RELEASED
-                        else:
-                            self.button2_pressed = False
-
-                    if MouseEvent.BUTTON3_RELEASED in mouse:
-                        if not self.button3_pressed:
-                            mouse &= ~MouseEvent.BUTTON3_RELEASED
-                        else:
-                            self.button3_pressed = False
+                    for lock, pressed, released in BUTTON_LOCKS:
+                        if mouse & pressed:
+                            if getattr(self, lock):
+                                mouse &= ~pressed
+                            else:
+                                setattr(self, lock, True)
+                        if mouse & released:
+                            if not getattr(self, lock):
+                                mouse &= ~released
+                            else:
+                                setattr(self, lock, False)
 
                     if mouse_x != self.mouse_x or mouse_y != self.mouse_y or mouse:
                         self.keyboard_mode = False
                     self.mouse_y, self.mouse_x = mouse_y, mouse_x
                 except curses.error:
-                    mouse = MouseEvent(0)
+                    mouse = 0
                 etype = 'mouse'
                 args = (self.mouse_y, self.mouse_x, mouse)
             else:
@@ -842,41 +1215,116 @@ class RootWidget(Widget):
                 args = (char,)
 
             try:
-                if winh < config.min_height or winw < config.min_width:
+                if self.winh < config.min_height or self.winw < config.min_width:
                     # ignore all events until size is fixed
                     continue
                 if etype == 'keyboard' and char != '\0':
+                    had_event = True
                     self.dispatch_event('keyboard', *args)
                 elif etype == 'mouse':
+                    had_event = True
                     self.dispatch_event('mouse', *args)
                 elif etype == "other":
-                    pass
-                elif not self.keyboard_mode:
-                    # hover
-                    self.dispatch_event('mouse', self.mouse_y, self.mouse_x, MouseEvent(0))
+                    had_event = True
+                elif not self.keyboard_mode and (
+                        (self.mouse_y, self.mouse_x) != self.last_hover
+                        or CellWidget.last_clear > self.last_hover_time
+                        or self.force_rerender):
+                    # hover. only needed when the cursor moved, the hover
+                    # highlight was cleared, or the widgets may have moved
+                    had_event = True
+                    self.dispatch_event('mouse', self.mouse_y, self.mouse_x, 0)
+                    self.last_hover = (self.mouse_y, self.mouse_x)
+                    self.last_hover_time = time.perf_counter()
 
             except GameOver as exc:
                 self.game_over = True
                 self.status.status = '😵'
                 exc.args[0].explode()
                 self.board.reveal_all()
+        return had_event
+
+    def tick(self):
+        """
+        this function is called for each iteration of the mainloop,
+        it is responsible for processing and dispatching keyboard
+        events and scheduling each widget to render
+        """
+        frame_started = time.perf_counter()
+        # the input that came in while waiting for this frame was already
+        # dispatched, but hasn't been rendered yet
+        had_event = self.process_events() or self.pending_input
+        self.pending_input = False
+
+        # the timer is the only thing on the screen that changes by itself,
+        # and it only shows hundredths of a second. without any input there's
+        # nothing to render until the timer moves on, or at all once it has
+        # stopped, apart from clearing the mouse highlight
+        timer_running = not (self.game_over or self.help.is_active)
+        elapsed = time.monotonic() - self.time_started
+        animating = config.show_animation and Widget._animation_frame < self.winh
+        idle = (not had_event and not self.force_rerender and self.layout is not None
+                and not (timer_running and int(elapsed * 100) != self.time_centis)
+                and not animating
+                and not (CellWidget.highlighted and not self.keyboard_mode and CellWidget.highlight_expired()))
 
         # caps the framerate by postponing rendering
         if config.framerate:
-            self.render()
-            curses.napms(floor((1 / config.framerate - (time.time() - self.monitor.last_frame)) * 1000))
+            if not idle:
+                self.render()
+            # sleep until the next frame is due. the sleep can overshoot by
+            # a millisecond or so, which is cheaper than spinning the cpu
+            # until the deadline. input that comes in meanwhile is handled
+            # right away, but only rendered once the frame is due
+            next_frame = self.schedule_frame(frame_started)
+            remaining = next_frame - time.perf_counter()
+            while remaining > 0:
+                if animating:
+                    # the input during the animation is thrown away by the
+                    # mainloop anyway
+                    time.sleep(remaining)
+                elif wait_for_input(remaining):
+                    self.pending_input = self.process_events() or self.pending_input
+                remaining = next_frame - time.perf_counter()
         else:
-            self.render()
-            curses.napms(1)  # voluntary context switch
+            if not idle:
+                self.render()
+            # rather than polling, sleep until there's input or the timer has
+            # to be redrawn. the wait is capped so that exiting and resizing
+            # are still noticed quickly
+            if timer_running:
+                timeout = 0.01 - elapsed % 0.01
+            elif animating or not idle:
+                timeout = 0.001
+            else:
+                timeout = 0.05
+            wait_for_input(timeout)
+
+    def schedule_frame(self, frame_started):
+        """
+        calculates when the next frame is due with a capped framerate. the
+        deadlines are a fixed period apart instead of counted from when each
+        frame started, so that the time between frames doesn't add up and
+        slow the framerate down
+        :param frame_started: the time.perf_counter() when the frame started
+        :return: the time.perf_counter() of the next deadline
+        """
+        self.next_frame += 1 / config.framerate
+        if self.next_frame <= frame_started:
+            # the frame overran by more than a period. start over from now
+            # rather than rushing through frames to catch up
+            self.next_frame = frame_started + 1 / config.framerate
+        return self.next_frame
 
     def render(self):
         """renders the entire window"""
 
         self.frame_count += 1
-        self.window.erase()
 
-        winh, winw = self.window.getmaxyx()
+        winh, winw = self.winh, self.winw
         if winh < config.min_height or winw < config.min_width:
+            self.window.erase()
+            self.layout = None
             self.addstr(3, 3, "Insufficient screen space", curses.color_pair(UI_ERROR))
             if winh < config.min_height:
                 self.addstr(4, 3, f"{config.min_height - winh} more rows required", curses.color_pair(UI_ERROR))
@@ -887,24 +1335,58 @@ class RootWidget(Widget):
                         curses.color_pair(UI_ERROR))
         else:
             if not self.help.is_active:
-                # fps also counts rendering time
-                # pause fps while help is active
+                # the fps counts the frames that are actually rendered, so
+                # the skipped idle iterations of the mainloop aren't in it.
+                # it pauses while help is active
                 self.monitor.tick()
 
             # populate widgets
             self.fps.set_fps(self.monitor.fps)
             self.flags.set_flag_counts(config.mine_count - self.board.flag_count())
             if not self.game_over and not self.help.is_active:
-                time_taken = datetime.datetime.now() - self.time_started
-                minute, second = divmod(time_taken.seconds, 60)
-                msec = str(time_taken.microseconds).zfill(2)[:2]
-                self.time_taken = f'{minute:0>2}:{second:0>2}.{msec}'
-                self.timer.set_text(self.time_taken)
+                # monotonic seconds are much cheaper than building a
+                # datetime and a timedelta every frame. the timer only shows
+                # hundredths of a second, so it's only formatted when that
+                # changes
+                centis = int((time.monotonic() - self.time_started) * 100)
+                if centis != self.time_centis:
+                    self.time_centis = centis
+                    seconds, centis = divmod(centis, 100)
+                    minute, second = divmod(seconds, 60)
+                    self.time_taken = f'{minute:0>2}:{second:0>2}.{centis:0>2}'
+                    self.timer.set_text(self.time_taken)
 
             self.calc_widget_locations()
 
+            # every widget paints over its whole area each frame, so the
+            # window is only erased when something may have been left behind
+            # from the last frame. curses keeps a copy of the screen and only
+            # sends the difference to the terminal on refresh, so this also
+            # saves it from comparing every line of the window
+            layout = [(w.y, w.x, w.h, w.w) for w in self.subwidgets]
+            if (layout != self.layout or self.force_rerender
+                    or config.show_animation and Widget._animation_frame < winh):
+                self.window.erase()
+                CellWidget.padded.clear()
+                self.layout = layout
+                for w in self.subwidgets:
+                    w.dirty = True
+            else:
+                # the mouse cursor and the highlight on the sides of the cells
+                # are the only things that move without changing the layout
+                if self.cursor is not None:
+                    try:
+                        self.window.addch(*self.cursor, ' ', curses.color_pair(DEFAULT))
+                    except curses.error:
+                        pass
+                    self.invalidate(*self.cursor)
+                CellWidget.clear_padding()
+
             try:
                 self.window.addch(self.mouse_y, self.mouse_x, curses.ACS_DIAMOND)
+                self.cursor = (self.mouse_y, self.mouse_x)
+                # the widgets under the cursor are painted over it
+                self.invalidate(self.mouse_y, self.mouse_x)
             except curses.error:
                 pass  # sometimes mouse fly around and that's ok
 
@@ -915,8 +1397,11 @@ class RootWidget(Widget):
                 self.board.reveal_all()
 
             for w in self.subwidgets:
-                if self.help.is_active and isinstance(w, GridWidget):
-                    # Hide the grid while help is active
+                if self.help.is_active and (w is self.grid or w is not self.help and self.help.covers(w)):
+                    # Hide the grid while help is active, and don't bother
+                    # with the widgets that the help window paints over.
+                    # they have to be painted in full once it's closed
+                    w.dirty = True
                     continue
                 w.render()
 
@@ -924,19 +1409,23 @@ class RootWidget(Widget):
         self.paint_window()
 
         # overwrite the close button onto the window
-        self.addstr(0, 6, '┬')
-        self.addstr(1, 6, '│')
-        self.addstr(2, 6, '┴')
+        self.addch(0, 6, curses.ACS_TTEE)
+        self.addch(1, 6, curses.ACS_VLINE)
+        self.addch(2, 6, curses.ACS_BTEE)
         if self.mouse_y == 1 and 2 <= self.mouse_x <= 5:
-            self.addstr(1, 2, ' Ｘ ', curses.color_pair(UI_HIGHLIGHT))
+            self.addstr(1, 2, ' Ｘ ', UI_HIGHLIGHT_ATTR)
         else:
-            self.addstr(1, 3, 'Ｘ')
+            self.addstr(1, 2, ' Ｘ ')
 
         # debug_print('Window render')
         if self.force_rerender:
             self.force_rerender = False
             self.window.clear()
-        self.window.refresh()
+            self.layout = None  # so that everything is painted again next frame
+        # copy the window to the virtual screen and update the terminal in
+        # one go, so more windows or pads can be added before the update
+        self.window.noutrefresh()
+        curses.doupdate()
 
     def mouse_event(self, y, x, mouse):
         """handles mouse events for root"""
@@ -957,15 +1446,17 @@ class RootWidget(Widget):
         """
 
         if key == 't':  # toggle emojis
-            config.use_emojis = bool(1 - config.use_emojis)
+            config.use_emojis = not config.use_emojis
+            CELL_PAINTS.clear()
+            self.force_rerender = True
         elif key == '\n':
             self.restart()
         elif key == ' ':
             if not self.game_over:
                 self.status.status = '😲'
 
-        for w in self.subwidgets:
-            w.dispatch_event('keyboard', key)
+        for w in self.keyboard_targets:
+            w.keyboard_event(key)
 
 
 def mainloop(win):
@@ -976,48 +1467,80 @@ def mainloop(win):
     signal.signal(signal.SIGINT, lambda signum, frame: root.exit())
     signal.signal(signal.SIGTERM, lambda signum, frame: root.exit())
     # so it only shuts down after a full frame is rendered
+    animating = True  # the widgets start with the animated addstr
     while True:
-        winh, winw = win.getmaxyx()
-        in_animation = root.animation_frame < winh
+        frame_started = time.perf_counter()
+        in_animation = root.animation_frame < root.winh
         root.animation_frame += in_animation
+        if bool(config.show_animation and in_animation) != animating:
+            # going through every widget is only worth it when this changes
+            animating = not animating
+            root.animate(animating)
         root.tick()
         if config.show_animation and in_animation:
             curses.flushinp()
-            curses.napms(20)
+            wait_for_animation(frame_started)
         if root.should_exit:
             if config.show_animation:
                 # wait until animation ends
                 signal.signal(signal.SIGINT, signal.SIG_IGN)
+                root.animate(True)
                 while root.animation_frame > 0:
                     # manager.animation_direction='reversed'
+                    frame_started = time.perf_counter()
                     root.animation_frame -= 1
                     root.tick()
-                    curses.napms(20)
+                    wait_for_animation(frame_started)
             return
 
 
+def wait_for_input(timeout: float) -> bool:
+    """
+    sleeps until there's input to read or the timeout has passed
+    :param timeout: the longest time to wait, in seconds
+    :return: whether there may be input to read
+    """
+    if sys.platform == 'win32':
+        # select only takes sockets on windows, so the input is polled
+        # every millisecond instead
+        curses.napms(1)
+        return True
+    return bool(select.select((sys.stdin,), (), (), timeout)[0])
+
+
+def wait_for_animation(frame_started):
+    """
+    sleep for what's left of an animation frame, so that the time spent
+    rendering doesn't slow the animation down
+    :param frame_started: the time.perf_counter() when the frame started
+    """
+    remaining = ANIMATION_FRAME_TIME - (time.perf_counter() - frame_started)
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+@lru_cache(4)
 def calc_first_frame(height, width):
     """
-    calculate the first frame to print for the startup animation
+    calculate the first frame to print for the startup animation. it's
+    cached because the exit animation plays the same frame backwards
     :param height: height of the screen
     :param width: width of the screen
-    :return: a list of strings, each representing a line
+    :return: a tuple of strings, each representing a line
     """
 
-    frame = []
-    line = ' ╭' + '─' * (width - 4) + '╮ '
-    frame.append(line)
-    frame.append(pad_window('TERMINAL MINESWEEPER', width, center=True))
-    line = ' ├' + '─' * (width - 4) + '┤ '
-    frame.append(line)
-    for y in range(height - 4):
-        frame.append(pad_window('', width))
-    line = ' ╰' + '─' * (width - 4) + '╯ '
-    frame.append(line)
-    return frame
+    horizontal = '─' * (width - 4)
+    frame = [' ╭' + horizontal + '╮ ',
+             pad_window(TITLE, width, center=True),
+             ' ├' + horizontal + '┤ ']
+    # the empty rows are all the same string
+    frame += [pad_window('', width)] * (height - 4)
+    frame.append(' ╰' + horizontal + '╯ ')
+    return tuple(frame)
 
 
 def main():
+    global UI_HIGHLIGHT_ATTR, UI_ALT_HIGHLIGHT_ATTR
     try:
         curses.setupterm("xterm-256color")
         stdscr = curses.initscr()
@@ -1033,6 +1556,14 @@ def main():
         curses.cbreak()
         stdscr.keypad(True)
         stdscr.nodelay(True)
+        # the cursor is invisible, so curses doesn't have to move it back to
+        # where the last character was written after each refresh
+        stdscr.leaveok(True)
+        stdscr.idlok(False)
+        stdscr.scrollok(False)
+        # don't stop a refresh halfway to check for input. the input is
+        # read once per frame anyway
+        curses.typeahead(-1)
 
         curses.mousemask(curses.REPORT_MOUSE_POSITION |
                          curses.ALL_MOUSE_EVENTS
@@ -1055,6 +1586,11 @@ def main():
             curses.init_pair(cell_color(i, False), VALUES[i], BG)
         stdscr.bkgd(' ', curses.color_pair(DEFAULT))
 
+        CELL_ATTRS[:] = [curses.color_pair(cell_color(v, h)) | curses.A_BOLD for v in range(9) for h in (False, True)]
+        UI_HIGHLIGHT_ATTR = curses.color_pair(UI_HIGHLIGHT)
+        UI_ALT_HIGHLIGHT_ATTR = curses.color_pair(UI_ALT_HIGHLIGHT)
+        CELL_PAINTS.clear()
+
         # initialization complete
         mainloop(stdscr)
     except InsufficientScreenSpace: